@@ -1,454 +1,484 @@
-from flask import Flask, jsonify, request
-from flask_cors import CORS
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from quart import Quart, Response, request
+from quart_cors import cors
+import asyncpg
+import asyncio
 import os
 from dotenv import load_dotenv
+import orjson
+from cachetools import TTLCache
+import pylibmc
+import hashlib
 import logging
+import logging.handlers
+import queue
+import atexit
 import traceback
 import sys
 load_dotenv()
 
-# Configure logging to output to console
+# Configure logging to output to console. Records are handed to a queue and
+# written by a listener thread, so request handlers never block on stdout.
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+log_queue = queue.SimpleQueue()
+queue_handler = logging.handlers.QueueHandler(log_queue)
+# Only merge msg % args here; the console handler applies the real format
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    handlers=[queue_handler]
 )
+log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+METERS_PER_MILE = 1609.34
+MAX_WELLS_LIMIT = 2000
+PRODUCTION_PREFETCH = 4096
+
+app = Quart(__name__)
 # Update CORS configuration to be more permissive for debugging
-CORS(app, 
-     resources={r"/*": {
-         "origins": ["*"],  # Allow all origins temporarily
-         "methods": ["GET", "POST", "OPTIONS"],
-         "allow_headers": ["Content-Type", "Authorization", "Access-Control-Allow-Origin"],
-         "expose_headers": ["Access-Control-Allow-Origin"],
-         "supports_credentials": False
-     }})
+app = cors(app,
+           allow_origin="*",  # Allow all origins temporarily
+           allow_methods=["GET", "POST", "OPTIONS"],
+           allow_headers=["Content-Type", "Authorization", "Access-Control-Allow-Origin"],
+           expose_headers=["Access-Control-Allow-Origin"],
+           allow_credentials=False)
 
 # Add CORS headers to all responses
 @app.after_request
-def after_request(response):
+async def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+def fast_json(obj, status=200):
+    """Serialize obj with orjson; drop-in replacement for jsonify."""
+    return Response(orjson.dumps(obj), mimetype='application/json', status=status)
+
 @app.before_request
-def log_request_info():
-    logger.info('Headers: %s', request.headers)
-    logger.info('Body: %s', request.get_data())
-    logger.info('URL: %s', request.url)
+async def log_request_info():
+    logger.debug('URL: %s len=%s', request.url, request.content_length)
+    # get_data() buffers the whole body, so only dump it when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Body: %s', await request.get_data())
+
+# Hot per-well lookups. asyncpg prepares each statement on first use and
+# caches it per pooled connection, so repeat requests skip parse/plan.
+GET_WELL_SQL = """
+    SELECT well_id, well_name
+    FROM demo.wells
+    WHERE api_14 = $1
+"""
+
+GET_PROD_SQL = """
+    SELECT 
+        to_char(prod_date, 'YYYY-MM-DD') as prod_date,
+        ROUND(oil::numeric, 2)::float8 as oil,
+        ROUND(gas::numeric, 2)::float8 as gas
+    FROM demo.production
+    WHERE api_14 = $1
+        AND oil IS NOT NULL 
+        AND gas IS NOT NULL
+    ORDER BY prod_date
+"""
 
-def get_db_connection():
-    load_dotenv()
+# Shared connection pool, created once when the server starts so requests
+# only pay for a checkout instead of a full connect/auth handshake
+POOL = None
 
-    conn = psycopg2.connect(
+@app.before_serving
+async def create_db_pool():
+    global POOL
+    POOL = await asyncpg.create_pool(
+        min_size=int(os.getenv('DB_POOL_MIN', 2)),
+        max_size=int(os.getenv('DB_POOL_MAX', 20)),
         host=os.getenv('DB_HOST'),
         database=os.getenv('DB_NAME'),
         user=os.getenv('DB_USER'),
         password=os.getenv('DB_PASSWORD')
+    )
+
+@app.after_serving
+async def close_db_pool():
+    await POOL.close()
 
+# Serialized /tr FeatureCollections keyed by basin. The TR grid is static, so
+# this is per-process; only the event loop thread touches it.
+TR_CACHE = TTLCache(maxsize=8, ttl=int(os.getenv('TR_CACHE_TTL', 300)))
+
+# Serialized /wells/<tr_id> responses shared across workers via memcached.
+# Disabled unless MEMCACHED_SERVERS (comma-separated host:port) is set;
+# pylibmc is blocking, so calls run in worker threads, each reserving a
+# client from a pool since pylibmc clients are not thread-safe. The default
+# pool size matches asyncio.to_thread's default executor so a thread never
+# waits long for a client; reserve() blocks rather than raising when empty.
+WELLS_CACHE_TTL = int(os.getenv('WELLS_CACHE_TTL', 600))
+MC_POOL = None
+if os.getenv('MEMCACHED_SERVERS'):
+    MC_POOL = pylibmc.ClientPool(
+        pylibmc.Client(os.getenv('MEMCACHED_SERVERS').split(','), binary=True),
+        int(os.getenv('MEMCACHED_POOL_SIZE', min(32, (os.cpu_count() or 1) + 4)))
     )
-    return conn
+
+def _mc_get(key):
+    with MC_POOL.reserve(block=True) as mc:
+        return mc.get(key)
+
+def _mc_set(key, payload):
+    with MC_POOL.reserve(block=True) as mc:
+        mc.set(key, payload, time=WELLS_CACHE_TTL)
+
+async def wells_cache_get(key):
+    if MC_POOL is None:
+        return None
+    try:
+        return await asyncio.to_thread(_mc_get, key)
+    except (pylibmc.Error, ValueError) as e:
+        logger.warning(f"Memcached get failed for {key}: {str(e)}")
+        return None
+
+async def wells_cache_set(key, payload):
+    if MC_POOL is None:
+        return
+    try:
+        await asyncio.to_thread(_mc_set, key, payload)
+    except (pylibmc.Error, ValueError) as e:
+        logger.warning(f"Memcached set failed for {key}: {str(e)}")
 
 
 @app.route('/tr')
-def get_tr_data():
+async def get_tr_data():
+    basin = 'DJ'
+    cached = TR_CACHE.get(basin)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+
     try:
-        conn = get_db_connection()
-        print(conn.get_dsn_parameters())
-        cur = conn.cursor()
-        
-        # Check if the table exists
-        cur.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'demo' 
-                AND table_name = 'tr'
-            );
-        """)
-        
-        table_exists = cur.fetchone()[0]
-        if not table_exists:
-            logger.error("Table demo.tr does not exist")
-            return jsonify({
-                "error": "Table not found",
-                "message": "The required table does not exist"
-            }), 404
-            
-        cur.close()
-        
-        # If table exists, proceed with the main query
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        try:
-            cur.execute("""
-                SELECT jsonb_build_object(
-                    'type',     'FeatureCollection',
-                    'features', COALESCE(jsonb_agg(feature), '[]'::jsonb)
-                ) as geojson
-                FROM (
+        async with POOL.acquire() as conn:
+            try:
+                geojson = await conn.fetchval("""
                     SELECT jsonb_build_object(
-                        'type',       'Feature',
-                        'geometry',   ST_AsGeoJSON(geom)::jsonb,
-                        'properties', jsonb_build_object(
-                            'id', id,
-                            'basin', basin,
-                            'state', state,
-                            'tr', tr
-                        )
-                    ) AS feature
-                    FROM demo.tr
-                    WHERE basin = 'DJ'
-                ) features;
-            """)
+                        'type',     'FeatureCollection',
+                        'features', COALESCE(jsonb_agg(feature ORDER BY id), '[]'::jsonb)
+                    )::text as geojson
+                    FROM (
+                        SELECT id, jsonb_build_object(
+                            'type',       'Feature',
+                            'geometry',   ST_AsGeoJSON(geom)::jsonb,
+                            'properties', jsonb_build_object(
+                                'id', id,
+                                'basin', basin,
+                                'state', state,
+                                'tr', tr
+                            )
+                        ) AS feature
+                        FROM demo.tr
+                        WHERE basin = $1
+                    ) features;
+                """, basin)
             
-            result = cur.fetchone()
-            
-            if result and result['geojson']:
-                return jsonify(result['geojson'])
+                # The FeatureCollection is serialized by Postgres; pass the text through untouched
+                if geojson:
+                    TR_CACHE[basin] = geojson
+                    return Response(geojson, mimetype='application/json')
                 
-            return jsonify({
-                "type": "FeatureCollection",
-                "features": []
-            })
+                return fast_json({
+                    "type": "FeatureCollection",
+                    "features": []
+                })
             
-        except Exception as query_error:
-            logger.error(f"Query execution error: {str(query_error)}")
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            raise
+            except Exception as query_error:
+                logger.error(f"Query execution error: {str(query_error)}")
+                logger.error(f"Full traceback: {traceback.format_exc()}")
+                raise
     
-    except psycopg2.Error as e:
+    except asyncpg.exceptions.UndefinedTableError:
+        logger.error("Table demo.tr does not exist")
+        return fast_json({
+            "error": "Table not found",
+            "message": "The required table does not exist"
+        }, 404)
+    
+    except asyncpg.PostgresError as e:
         logger.error(f"Database error: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
-        return jsonify({
+        return fast_json({
             "error": "Database error",
             "message": str(e)
-        }), 500
+        }, 500)
         
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
-        return jsonify({
+        return fast_json({
             "error": "Server error",
             "message": str(e)
-        }), 500
-        
-    finally:
-        if 'cur' in locals():
-            cur.close()
-        if 'conn' in locals():
-            conn.close()
+        }, 500)
 
 @app.route('/wells/<tr_id>')
-def get_wells_by_tr(tr_id):
+async def get_wells_by_tr(tr_id):
     try:
-        radius = request.args.get('radius', default=10, type=float)
-        logger.info(f"Received request for TR {tr_id} with radius {radius} miles")
-        
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # First get the centroid for the selected TR
-        cur.execute("""
-            SELECT ST_X(centroid) as lon, ST_Y(centroid) as lat 
-            FROM demo.tr 
-            WHERE tr = %s AND basin = 'DJ'
-        """, (tr_id,))
-        
-        tr_point = cur.fetchone()
-        if not tr_point:
-            return jsonify({
-                "error": "TR not found",
-                "message": f"Could not find TR {tr_id}"
-            }), 404
+        # Rounded so the query matches the cache key it is stored under
+        radius = round(request.args.get('radius', default=10, type=float), 1)
+        # Nearest-first row cap so the KNN index scan can stop after k wells
+        limit = min(max(request.args.get('limit', default=500, type=int), 1), MAX_WELLS_LIMIT)
+        logger.debug("Received request for TR %s with radius %s miles, limit %s", tr_id, radius, limit)
+        
+        # tr_id is a raw URL segment; hash it so the key is always a valid memcached key
+        tr_key = hashlib.sha1(tr_id.encode()).hexdigest()
+        cache_key = f"wells:{tr_key}:{radius:.1f}:{limit}"
+        cached = await wells_cache_get(cache_key)
+        if cached is not None:
+            return Response(cached, mimetype='application/json')
+        
+        async with POOL.acquire() as conn:
+            # First get the centroid for the selected TR
+            tr_point = await conn.fetchrow("""
+                SELECT ST_X(centroid) as lon, ST_Y(centroid) as lat 
+                FROM demo.tr 
+                WHERE tr = $1 AND basin = 'DJ'
+            """, tr_id)
+
+            if not tr_point:
+                return fast_json({
+                    "error": "TR not found",
+                    "message": f"Could not find TR {tr_id}"
+                }, 404)
             
-        # Log the query parameters
-        logger.info(f"Querying wells around point ({tr_point['lon']}, {tr_point['lat']}) with {radius} mile radius")
-        
-        # Get wells within radius
-        cur.execute("""
-            SELECT 
-                w.well_id,
-                w.api_14,
-                w.well_name,
-                w.env_operator,
-                w.interval,
-                w.spud_date,
-                w.lateral_length,
-                ST_AsGeoJSON(w.geom)::json as geometry
-            FROM demo.wells w
-            WHERE w.geom IS NOT NULL
-                AND ST_DistanceSphere(
-                    w.geom, 
-                    ST_SetSRID(ST_MakePoint(%s, %s), 4326)
-                ) <= %s * 1609.34
-                AND w.spud_date > '2010-01-01'::date
-            ORDER BY w.geom <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326)
-        """, (tr_point['lon'], tr_point['lat'], radius, tr_point['lon'], tr_point['lat']))
-        
-        wells = cur.fetchall()
-        logger.info(f"Found {len(wells)} wells within {radius} miles of TR {tr_id}")
+            # Log the query parameters
+            logger.debug("Querying wells around point (%s, %s) with %s mile radius", tr_point['lon'], tr_point['lat'], radius)
+        
+            # Get wells within radius, assembled into a FeatureCollection by Postgres.
+            # The inner ORDER BY ... LIMIT picks the nearest wells; the aggregate
+            # re-applies the order since jsonb_agg doesn't preserve input order.
+            # One well past the limit is fetched so the response can say whether
+            # it was truncated ('limit' / 'truncated' members).
+            geojson = await conn.fetchval("""
+                SELECT jsonb_build_object(
+                    'type',      'FeatureCollection',
+                    'features',  COALESCE(
+                        jsonb_agg(feature ORDER BY dist) FILTER (WHERE rn <= $4::int),
+                        '[]'::jsonb
+                    ),
+                    'limit',     $4::int,
+                    'truncated', COUNT(*) > $4::int
+                )::text as geojson
+                FROM (
+                    SELECT dist, feature, row_number() OVER (ORDER BY dist) as rn
+                    FROM (
+                        SELECT 
+                            w.geog <-> ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography as dist,
+                            jsonb_build_object(
+                                'type',       'Feature',
+                                'geometry',   ST_AsGeoJSON(w.geom)::jsonb,
+                                'properties', jsonb_build_object(
+                                    'well_id', w.well_id,
+                                    'api_14', w.api_14,
+                                    'well_name', w.well_name,
+                                    'env_operator', w.env_operator,
+                                    'interval', w.interval,
+                                    'spud_date', w.spud_date,
+                                    'lateral_length', w.lateral_length
+                                )
+                            ) AS feature
+                        FROM demo.wells w
+                        WHERE w.geog IS NOT NULL
+                            AND ST_DWithin(
+                                w.geog,
+                                ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography,
+                                $3
+                            )
+                            AND w.spud_date > DATE '2010-01-01'
+                        ORDER BY w.geog <-> ST_SetSRID(ST_MakePoint($1, $2), 4326)::geography
+                        LIMIT $4::int + 1
+                    ) nearest
+                ) features;
+            """, tr_point['lon'], tr_point['lat'], radius * METERS_PER_MILE, limit)
         
-        # Debug: Log first few wells
-        if wells:
-            logger.info("Sample wells:")
-            for well in wells[:3]:
-                logger.info(f"API: {well['api_14']}, Name: {well['well_name']}")
+            logger.debug("Returning wells within %s miles of TR %s", radius, tr_id)
         
-        return jsonify({
-            "type": "FeatureCollection",
-            "features": [{
-                "type": "Feature",
-                "geometry": well['geometry'],
-                "properties": {
-                    k: v for k, v in well.items() if k != 'geometry'
-                }
-            } for well in wells]
-        })
+            await wells_cache_set(cache_key, geojson)
+            return Response(geojson, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error fetching wells: {str(e)}")
         logger.error(traceback.format_exc())
-        return jsonify({
+        return fast_json({
             "error": "Server error",
             "message": str(e)
-        }), 500
-        
+        }, 500)
+
+def encode_production_rows(rows):
+    """Encode production records as comma-separated [date, oil, gas] triples."""
+    return orjson.dumps([tuple(row) for row in rows])[1:-1]
+
+async def stream_production(api_14, well_name, conn, transaction, cursor, rows):
+    """Yield the production payload in PRODUCTION_PREFETCH-row chunks.
+
+    Used when the first cursor fetch came back full, so more rows may follow.
+    Takes ownership of conn, which already has the cursor open, and commits
+    and releases it as soon as a short fetch shows the query is exhausted,
+    before that last chunk is written out. The first (empty) yield lets the
+    caller start the generator before handing it to the Response, so the
+    finally block runs even if it is never read.
+    """
+    try:
+        yield b''
+        yield (
+            orjson.dumps({"api_14": api_14, "well_name": well_name})[:-1]
+            + b',"production":[' + encode_production_rows(rows)
+        )
+        record_count = len(rows)
+        while len(rows) == PRODUCTION_PREFETCH:
+            rows = await cursor.fetch(PRODUCTION_PREFETCH)
+            if len(rows) < PRODUCTION_PREFETCH:
+                await transaction.commit()
+                await POOL.release(conn)
+                conn = None
+            if rows:
+                yield b',' + encode_production_rows(rows)
+                record_count += len(rows)
+
+        logger.debug("Query returned %s production records", record_count)
+        yield b'],"record_count":' + str(record_count).encode() + b'}'
     finally:
-        if 'cur' in locals():
-            cur.close()
-        if 'conn' in locals():
-            conn.close()
+        # Releasing also rolls back the transaction if the stream was cut short
+        if conn is not None:
+            await POOL.release(conn)
 
 @app.route('/wells/<api_14>/production')
-def get_well_production(api_14):
-    logger.info(f"=== Starting production request for API: {api_14} ===")
+async def get_well_production(api_14):
+    logger.debug("=== Starting production request for API: %s ===", api_14)
+    conn = None
     try:
-        conn = get_db_connection()
-        logger.info("Database connection established")
-        
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Debug query to see what's in the wells table
-        cur.execute("""
-            SELECT COUNT(*) as count 
-            FROM demo.wells
-        """)
-        total_wells = cur.fetchone()
-        logger.info(f"Total wells in database: {total_wells['count']}")
+        conn = await POOL.acquire()
+        logger.debug("Database connection established")
         
         # First verify the well exists
-        well_query = """
-            SELECT well_id, well_name 
-            FROM demo.wells 
-            WHERE api_14 = %s
-        """
-        logger.info(f"Executing well query: {well_query} with API: {api_14}")
-        cur.execute(well_query, (api_14,))
-        
-        well = cur.fetchone()
+        logger.debug("Executing well query with API: %s", api_14)
+        well = await conn.fetchrow(GET_WELL_SQL, api_14)
         if not well:
-            # Debug query to see similar API numbers
-            cur.execute("""
-                SELECT api_14, well_name 
-                FROM demo.wells 
-                WHERE api_14 LIKE %s
-                LIMIT 5
-            """, (f"{api_14[:5]}%",))
-            similar_wells = cur.fetchall()
-            logger.warning(f"Well not found. Similar APIs: {similar_wells}")
-            
-            return jsonify({
+            logger.warning(f"Well not found for API: {api_14}")
+        
+            return fast_json({
                 "error": "Well not found",
                 "message": f"Could not find well with API: {api_14}",
                 "details": {
-                    "similar_wells": similar_wells,
                     "api_searched": api_14
                 }
-            }), 404
-        
-        logger.info(f"Found well: {well['well_name']} (API: {api_14})")
-        
-        # Get production data with debug query
-        query = """
-            SELECT 
-                prod_date::date,
-                ROUND(oil::numeric, 2) as oil,
-                ROUND(gas::numeric, 2) as gas
-            FROM demo.production
-            WHERE api_14 = %s
-                AND oil IS NOT NULL 
-                AND gas IS NOT NULL
-            ORDER BY prod_date
-        """
-        
-        logger.info(f"Executing production query: {query} with API: {api_14}")
-        
-        cur.execute(query, (api_14,))
-        production = cur.fetchall()
-        
-        # Log detailed results
-        logger.info(f"Query returned {len(production)} production records")
-        if len(production) > 0:
-            logger.info(f"Sample first record: {production[0]}")
-            logger.info(f"Sample last record: {production[-1]}")
-        else:
-            # Check if any production exists without NULL filters
-            cur.execute("""
-                SELECT COUNT(*), 
-                       COUNT(*) FILTER (WHERE oil IS NULL) as null_oil,
-                       COUNT(*) FILTER (WHERE gas IS NULL) as null_gas
-                FROM demo.production 
-                WHERE api_14 = %s
-            """, (api_14,))
-            counts = cur.fetchone()
-            logger.warning(
-                f"No production found with non-null values. "
-                f"Total records: {counts['count']}, "
-                f"Null oil: {counts['null_oil']}, "
-                f"Null gas: {counts['null_gas']}"
-            )
+            }, 404)
+        
+        well_name = well['well_name']
+        logger.debug("Found well: %s (API: %s)", well_name, api_14)
+        
+        # Open the server-side cursor and fetch the first chunk here, so a
+        # failing query still returns the 500 body below instead of a cut-off 200
+        logger.debug("Streaming production query with API: %s", api_14)
+        transaction = conn.transaction()
+        await transaction.start()
+        cursor = await conn.cursor(GET_PROD_SQL, api_14)
+        rows = await cursor.fetch(PRODUCTION_PREFETCH)
+        
+        # Typical case: one well's history fits in the first fetch. Finish the
+        # transaction and let the finally below release the connection now,
+        # instead of holding it while the client reads the body.
+        if len(rows) < PRODUCTION_PREFETCH:
+            await transaction.commit()
+            logger.debug("Query returned %s production records", len(rows))
+            if not rows:
+                logger.warning(f"No production found with non-null values for API: {api_14}")
+            return fast_json({
+                "api_14": api_14,
+                "well_name": well_name,
+                "production": [tuple(row) for row in rows],
+                "record_count": len(rows)
+            })
         
-        return jsonify({
-            "api_14": api_14,
-            "well_name": well['well_name'],
-            "production": production,
-            "record_count": len(production)
-        })
+        body = stream_production(api_14, well_name, conn, transaction, cursor, rows)
+        await body.__anext__()
+        conn = None  # now owned by the stream
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error fetching production for API {api_14}")
         logger.error(f"Exception type: {type(e).__name__}")
         logger.error(f"Exception message: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({
+        return fast_json({
             "error": "Server error",
             "message": str(e),
             "type": type(e).__name__,
             "api_14": api_14
-        }), 500
+        }, 500)
         
     finally:
-        if 'cur' in locals():
-            cur.close()
-        if 'conn' in locals():
-            conn.close()
+        if conn is not None:
+            await POOL.release(conn)
 
 @app.route('/wells/aggregate-production', methods=['POST'])
-def get_aggregate_production():
+async def get_aggregate_production():
     try:
-        # Log the incoming request
-        logger.info(f"Received production request - Headers: {request.headers}")
-        logger.info(f"Request data: {request.get_data()}")
-        
-        api_list = request.json.get('apis', [])
+        api_list = (await request.get_json()).get('apis', [])
         if not api_list:
             logger.warning("No APIs provided in request")
-            return jsonify({
+            return fast_json({
                 "error": "No APIs provided",
                 "message": "Please provide a list of API14s"
-            }), 400
-
-        logger.info(f"Processing production for APIs: {api_list[:5]}...")  # Log first 5 APIs
-        
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Verify APIs exist in the database
-        cur.execute("""
-            SELECT DISTINCT api_14 
-            FROM demo.wells 
-            WHERE api_14 = ANY(%s)
-        """, (api_list,))
-        found_apis = [row['api_14'] for row in cur.fetchall()]
-        
-        if not found_apis:
-            logger.warning(f"No matching APIs found in database")
-            return jsonify({
-                "error": "No matching wells",
-                "message": "None of the provided APIs were found in the database",
-                "requested_apis": api_list
-            }), 404
-            
-        logger.info(f"Found {len(found_apis)} matching wells in database")
+            }, 400)
 
-        # Query to get individual well production data normalized by months
-        query = """
-            WITH first_prod AS (
-                SELECT 
-                    api_14,
-                    MIN(prod_date) as first_prod_date
-                FROM demo.production
-                WHERE api_14 = ANY(%s)
-                GROUP BY api_14
-            ),
-            monthly_prod AS (
-                SELECT 
-                    p.api_14,
-                    EXTRACT(YEAR FROM age(p.prod_date::date, fp.first_prod_date::date)) * 12 +
-                    EXTRACT(MONTH FROM age(p.prod_date::date, fp.first_prod_date::date)) + 1 as month_num,
-                    p.oil
-                FROM demo.production p
-                JOIN first_prod fp ON p.api_14 = fp.api_14
-                WHERE p.oil IS NOT NULL
-                    AND p.api_14 = ANY(%s)
-            )
-            SELECT 
-                api_14,
-                month_num,
-                ROUND(oil::numeric, 2) as oil
-            FROM monthly_prod
-            WHERE month_num <= 48
-            ORDER BY api_14, month_num;
-        """
-        
-        logger.info("Executing production query...")
-        cur.execute(query, (api_list, api_list))
-        results = cur.fetchall()
-        
-        # Organize data by API
-        wells_data = {}
-        for row in results:
-            api = row['api_14']
-            if api not in wells_data:
-                wells_data[api] = []
-            wells_data[api].append({
-                'month': row['month_num'],
-                'oil': row['oil']
-            })
-        
-        logger.info(f"Processed production data for {len(wells_data)} wells")
-        # Add sample data logging
-        if wells_data:
-            sample_api = next(iter(wells_data))
-            logger.info(f"Sample data structure for API {sample_api}:")
-            logger.info(f"First 3 months: {wells_data[sample_api][:3]}")
-        
-        return jsonify({
-            "success": True,
-            "data": wells_data,
-            "well_count": len(wells_data)
-        })
+        logger.debug("Processing production for APIs: %s...", api_list[:5])  # Log first 5 APIs
+        
+        async with POOL.acquire() as conn:
+            # Individual well production normalized by months since first production.
+            # One pass over demo.production: the first production date comes from a
+            # window over the same rows instead of a separate CTE scan. The response
+            # body, grouped by API, is built by Postgres and returned as-is.
+            query = """
+                SELECT json_build_object(
+                    'success',    true,
+                    'data',       COALESCE(json_object_agg(api_14, months), '{}'::json),
+                    'well_count', COUNT(*)
+                )::text as payload
+                FROM (
+                    SELECT 
+                        api_14,
+                        json_agg(
+                            json_build_object('month', month_num, 'oil', oil)
+                            ORDER BY month_num
+                        ) as months
+                    FROM (
+                        SELECT 
+                            api_14,
+                            (date_part('year', prod_date)::int - date_part('year', MIN(prod_date) OVER w)::int) * 12 +
+                            (date_part('month', prod_date)::int - date_part('month', MIN(prod_date) OVER w)::int) + 1 as month_num,
+                            ROUND(oil::numeric, 2) as oil
+                        FROM demo.production
+                        WHERE api_14 = ANY($1)
+                        WINDOW w AS (PARTITION BY api_14)
+                    ) monthly_prod
+                    WHERE oil IS NOT NULL
+                        AND month_num <= 48
+                    GROUP BY api_14
+                ) wells_data;
+            """
+        
+            logger.debug("Executing production query...")
+            payload = await conn.fetchval(query, api_list)
+        
+            return Response(payload, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error fetching production: {str(e)}")
         logger.error(traceback.format_exc())
-        return jsonify({
+        return fast_json({
             "error": "Server error",
             "message": str(e)
-        }), 500
-        
-    finally:
-        if 'cur' in locals():
-            cur.close()
-        if 'conn' in locals():
-            conn.close()
+        }, 500)
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,9 @@
+-- Spatial indexes for the radius search in GET /wells/<tr_id>.
+--
+-- wells_geom_gix backs the KNN ordering (geom <-> point). The ST_DWithin
+-- filter runs on geom::geography, which can only use an index built on the
+-- same expression, so wells_geom_geog_gix covers that.
+CREATE INDEX IF NOT EXISTS wells_geom_gix ON demo.wells USING GIST (geom);
+CREATE INDEX IF NOT EXISTS wells_geom_geog_gix ON demo.wells USING GIST ((geom::geography));
+
+ANALYZE demo.wells;
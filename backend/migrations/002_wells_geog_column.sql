@@ -0,0 +1,19 @@
+-- Precomputed geography column for the radius search in GET /wells/<tr_id>,
+-- so the query filters and orders on geog directly instead of casting geom
+-- on every row. Wells are stored as lateral linestrings, so the column takes
+-- the generic Geometry subtype rather than Point.
+--
+-- ADD COLUMN ... GENERATED ... STORED rewrites all of demo.wells under an
+-- ACCESS EXCLUSIVE lock; run it in a maintenance window.
+ALTER TABLE demo.wells
+    ADD COLUMN IF NOT EXISTS geog geography(Geometry, 4326)
+    GENERATED ALWAYS AS (geom::geography) STORED;
+
+CREATE INDEX IF NOT EXISTS wells_geog_gix ON demo.wells USING GIST (geog);
+
+-- Superseded by wells_geog_gix: both the ST_DWithin filter and the <->
+-- ordering now run on geog, so no query uses the geom indexes from 001.
+DROP INDEX IF EXISTS demo.wells_geom_geog_gix;
+DROP INDEX IF EXISTS demo.wells_geom_gix;
+
+ANALYZE demo.wells;
@@ -0,0 +1,13 @@
+-- Covering index for the per-well production queries (api_14 = $1 /
+-- api_14 = ANY($1), ordered by prod_date). INCLUDE (oil, gas) lets them run
+-- as index-only scans once the visibility map is current.
+CREATE INDEX IF NOT EXISTS prod_api_date_idx
+    ON demo.production (api_14, prod_date) INCLUDE (oil, gas);
+
+-- One-time physical reorder so each well's rows sit on adjacent pages.
+-- CLUSTER takes an ACCESS EXCLUSIVE lock on demo.production for its
+-- duration; run it in a maintenance window and re-run after large loads.
+CLUSTER demo.production USING prod_api_date_idx;
+
+-- The VACUUM ANALYZE that index-only scans depend on lives in
+-- 004_production_vacuum.sql, since VACUUM cannot run inside a transaction.
@@ -0,0 +1,5 @@
+-- Refresh planner stats and the visibility map needed for index-only scans
+-- on prod_api_date_idx (003). VACUUM cannot run inside a transaction block:
+-- apply this file on its own, without psql -1 or a migration-runner
+-- transaction wrapper.
+VACUUM ANALYZE demo.production;
@@ -17,6 +17,8 @@ interface MapState {
   wellsData: FeatureCollection | null
   selectedTR: string | null
   radius: number
+  wellsLimit: number
+  wellsTruncated: boolean
   isLoadingWells: boolean
   operatorColors: Record<string, string>
   selectedOperators: string[]
@@ -34,6 +36,9 @@ export const useMapStore = defineStore('map', {
     wellsData: null,
     selectedTR: null,
     radius: 10,
+    // Max wells requested per TR; the API returns the nearest wells first
+    wellsLimit: 2000,
+    wellsTruncated: false,
     isLoadingWells: false,
     operatorColors: {},
     selectedOperators: [],
@@ -144,17 +149,22 @@ export const useMapStore = defineStore('map', {
       this.isLoadingWells = true
       const config = useRuntimeConfig()
       try {
-        const response = await fetch(`${config.public.flaskBaseUrl}/wells/${tr}?radius=${this.radius}`)
+        const response = await fetch(`${config.public.flaskBaseUrl}/wells/${tr}?radius=${this.radius}&limit=${this.wellsLimit}`)
         if (!response.ok) {
           const errorData = await response.json().catch(() => ({}))
           throw new Error(errorData.message || `HTTP error! status: ${response.status}`)
         }
-        const wellsData = await response.json() as FeatureCollection
+        const wellsData = await response.json() as FeatureCollection & { truncated?: boolean }
         
         if (wellsData.type !== 'FeatureCollection') {
           throw new Error('Invalid GeoJSON response')
         }
 
+        this.wellsTruncated = Boolean(wellsData.truncated)
+        if (this.wellsTruncated) {
+          console.warn(`Wells for TR ${tr} truncated to the nearest ${this.wellsLimit}`)
+        }
+
         // Generate colors for unique operators
         const operators = new Set(
           wellsData.features.map(f => f.properties?.env_operator).filter(Boolean)
@@ -173,6 +183,7 @@ export const useMapStore = defineStore('map', {
       } catch (error) {
         console.error('Error fetching wells:', error)
         this.wellsData = { type: 'FeatureCollection', features: [] }
+        this.wellsTruncated = false
         throw error // Re-throw to handle in components if needed
       } finally {
         this.isLoadingWells = false